@@ -310,7 +310,7 @@ def __init__(ctx):
         ctx._constant = type('ivmpf_constant', (ivmpf_constant,), {})
         ctx._prec = [53]
         ctx._set_prec(53)
-        ctx._constant._ctxdata = ctx.mpf._ctxdata = ctx.mpc._ctxdata = [ctx.mpf, new, ctx._prec]
+        ctx._constant._ctxdata = ctx.mpf._ctxdata = ctx.mpc._ctxdata = (ctx.mpf, new, ctx._prec)
         ctx._constant.ctx = ctx.mpf.ctx = ctx.mpc.ctx = ctx
         ctx.pretty = False
         StandardBaseContext.__init__(ctx)
@@ -384,12 +384,18 @@ def f_wrapped(ctx, *args, **kwargs):
         setattr(cls, name, f_wrapped)
 
     def _set_prec(ctx, n):
-        ctx._prec[0] = max(1, int(n))
+        p = int(n)
+        if p < 1:
+            p = 1
+        ctx._prec[0] = p
         ctx._dps = prec_to_dps(n)
 
     def _set_dps(ctx, n):
+        d = int(n)
+        if d < 1:
+            d = 1
         ctx._prec[0] = dps_to_prec(n)
-        ctx._dps = max(1, int(n))
+        ctx._dps = d
 
     prec = property(lambda ctx: ctx._prec[0], _set_prec)
     dps = property(lambda ctx: ctx._dps, _set_dps)
@@ -6,8 +6,6 @@
 
 import functools
 
-import re
-
 from .ctx_base import StandardBaseContext
 
 from .libmp.backend import basestring, BACKEND
@@ -42,8 +40,71 @@
 
 new = object.__new__
 
-get_complex = re.compile(r'^\(?(?P<re>[\+\-]?\d*(\.\d*)?(e[\+\-]?\d+)?)??'
-                         r'(?P<im>[\+\-]?\d*(\.\d*)?(e[\+\-]?\d+)?j)?\)?$')
+# The fadd/fsub/fmul/fdiv/fneg fast paths build their mpf result inline
+# with new() on the pure Python backend. The sage mpf is an extension
+# type, so those paths go through ctx.make_mpf there.
+_inline_new = BACKEND != 'sage'
+
+# MPContext.bernoulli caches B_n for n < _BERNOULLI_CACHE_N, keyed by
+# (n, prec, rounding), keeping at most _BERNOULLI_CACHE_SIZE entries
+_BERNOULLI_CACHE_N = 128
+_BERNOULLI_CACHE_SIZE = 1000
+
+_digits = '0123456789'
+
+def _is_decimal(s):
+    """
+    Check that s has the form [+-]ddd[.ddd][e[+-]ddd], where every
+    part except the exponent digits is optional.
+    """
+    n = len(s)
+    i = 0
+    if i < n and s[i] in '+-':
+        i += 1
+    while i < n and s[i] in _digits:
+        i += 1
+    if i < n and s[i] == '.':
+        i += 1
+        while i < n and s[i] in _digits:
+            i += 1
+    if i < n and s[i] == 'e':
+        i += 1
+        if i < n and s[i] in '+-':
+            i += 1
+        j = i
+        while i < n and s[i] in _digits:
+            i += 1
+        if i == j:
+            return False
+    return i == n
+
+def _parse_complex(s):
+    """
+    Split a lowercase string without spaces such as '(1.5-2e-3j)' into
+    the strings of its real and imaginary parts, ('1.5', '-2e-3j').
+    The real part may be empty. Returns None if s is not of this form.
+
+    The string is scanned once from the right for the sign separating
+    the two parts, skipping a sign that belongs to an exponent.
+    """
+    if s[:1] == '(':
+        s = s[1:]
+    if s[-1:] == ')':
+        s = s[:-1]
+    if s[-1:] != 'j':
+        return None
+    k = len(s) - 2
+    while k > 0:
+        c = s[k]
+        if c in '+-' and s[k-1] != 'e':
+            break
+        k -= 1
+    if k < 0:
+        k = 0
+    re, im = s[:k], s[k:]
+    if _is_decimal(re) and _is_decimal(im[:-1]):
+        return re, im
+    return None
 
 if BACKEND == 'sage':
     from sage.libs.mpmath.ext_main import Context as BaseMPContext
@@ -64,8 +125,9 @@ def __init__(ctx):
         BaseMPContext.__init__(ctx)
         ctx.trap_complex = False
         ctx.pretty = False
-        ctx.types = [ctx.mpf, ctx.mpc, ctx.constant]
+        ctx.types = frozenset([ctx.mpf, ctx.mpc, ctx.constant])
         ctx._mpq = rational.mpq
+        ctx._bernoulli_cache = {}
         ctx.default()
         StandardBaseContext.__init__(ctx)
 
@@ -93,6 +155,12 @@ def __init__(ctx):
         ctx.cospi.__doc_ = function_docs.cospi
         ctx.sinpi.__doc_ = function_docs.sinpi
 
+    if BACKEND == 'sage':
+        # PythonMPContext restores a saved (prec, dps) pair directly;
+        # the sage context only has the prec/dps setters
+        def _set_prec_dps(ctx, prec, dps):
+            ctx.prec = prec
+
     def init_builtins(ctx):
 
         mpf = ctx.mpf
@@ -188,7 +256,8 @@ def hypot(ctx, x, y):
         to `\sqrt{x^2 + y^2}`. Both `x` and `y` must be real."""
         x = ctx.convert(x)
         y = ctx.convert(y)
-        return ctx.make_mpf(libmp.mpf_hypot(x._mpf_, y._mpf_, *ctx._prec_rounding))
+        prec, rounding = ctx._prec_rounding
+        return ctx.make_mpf(libmp.mpf_hypot(x._mpf_, y._mpf_, prec, rounding))
 
     def _gamma_upper_int(ctx, n, z):
         n = int(ctx._re(n))
@@ -217,16 +286,17 @@ def _expint_int(ctx, n, z):
             return ctx.make_mpc((real, imag))
 
     def _nthroot(ctx, x, n):
+        prec, rounding = ctx._prec_rounding
         if hasattr(x, '_mpf_'):
             try:
-                return ctx.make_mpf(libmp.mpf_nthroot(x._mpf_, n, *ctx._prec_rounding))
+                return ctx.make_mpf(libmp.mpf_nthroot(x._mpf_, n, prec, rounding))
             except ComplexResult:
                 if ctx.trap_complex:
                     raise
                 x = (x._mpf_, libmp.fzero)
         else:
             x = x._mpc_
-        return ctx.make_mpc(libmp.mpc_nthroot(x, n, *ctx._prec_rounding))
+        return ctx.make_mpc(libmp.mpc_nthroot(x, n, prec, rounding))
 
     def _besselj(ctx, n, z):
         prec, rounding = ctx._prec_rounding
@@ -250,23 +320,40 @@ def _agm(ctx, a, b=1):
         return ctx.make_mpc(libmp.mpc_agm(a, b, prec, rounding))
 
     def bernoulli(ctx, n):
-        return ctx.make_mpf(libmp.mpf_bernoulli(int(n), *ctx._prec_rounding))
+        prec, rounding = ctx._prec_rounding
+        n = int(n)
+        key = n, prec, rounding
+        cache = ctx._bernoulli_cache
+        v = cache.get(key)
+        if v is None:
+            v = libmp.mpf_bernoulli(n, prec, rounding)
+            if 0 <= n < _BERNOULLI_CACHE_N and \
+                len(cache) < _BERNOULLI_CACHE_SIZE:
+                cache[key] = v
+        return ctx.make_mpf(v)
 
     def _zeta_int(ctx, n):
-        return ctx.make_mpf(libmp.mpf_zeta_int(int(n), *ctx._prec_rounding))
+        prec, rounding = ctx._prec_rounding
+        return ctx.make_mpf(libmp.mpf_zeta_int(int(n), prec, rounding))
 
     def atan2(ctx, y, x):
-        x = ctx.convert(x)
-        y = ctx.convert(y)
-        return ctx.make_mpf(libmp.mpf_atan2(y._mpf_, x._mpf_, *ctx._prec_rounding))
+        mpf = ctx.mpf
+        if type(x) is not mpf:
+            x = ctx.convert(x)
+        if type(y) is not mpf:
+            y = ctx.convert(y)
+        prec, rounding = ctx._prec_rounding
+        return ctx.make_mpf(libmp.mpf_atan2(y._mpf_, x._mpf_, prec, rounding))
 
     def psi(ctx, m, z):
-        z = ctx.convert(z)
+        if type(z) not in ctx.types:
+            z = ctx.convert(z)
         m = int(m)
+        prec, rounding = ctx._prec_rounding
         if ctx._is_real_type(z):
-            return ctx.make_mpf(libmp.mpf_psi(m, z._mpf_, *ctx._prec_rounding))
+            return ctx.make_mpf(libmp.mpf_psi(m, z._mpf_, prec, rounding))
         else:
-            return ctx.make_mpc(libmp.mpc_psi(m, z._mpc_, *ctx._prec_rounding))
+            return ctx.make_mpc(libmp.mpc_psi(m, z._mpc_, prec, rounding))
 
     def cos_sin(ctx, x, **kwargs):
         if type(x) not in ctx.types:
@@ -332,6 +419,13 @@ def isnan(ctx, x):
             True
 
         """
+        t = type(x)
+        if t is ctx.mpf:
+            return x._mpf_ == fnan
+        if t is ctx.mpc:
+            return fnan in x._mpc_
+        if t in int_types:
+            return False
         if hasattr(x, "_mpf_"):
             return x._mpf_ == fnan
         if hasattr(x, "_mpc_"):
@@ -365,6 +459,10 @@ def isfinite(ctx, x):
             False
 
         """
+        if type(x) is ctx.mpf:
+            # Only zero has a zero mantissa and a zero exponent
+            sign, man, exp, bc = x._mpf_
+            return bool(man) or not exp
         if ctx.isinf(x) or ctx.isnan(x):
             return False
         return True
@@ -373,6 +471,15 @@ def isnpint(ctx, x):
         """
         Determine if *x* is a nonpositive integer.
         """
+        t = type(x)
+        if t is ctx.mpf:
+            sign, man, exp, bc = x._mpf_
+            if not man:
+                # zero, or a special value
+                return not exp
+            return sign and exp >= 0
+        if t in int_types:
+            return x <= 0
         if not x:
             return True
         if hasattr(x, '_mpf_'):
@@ -380,12 +487,9 @@ def isnpint(ctx, x):
             return sign and exp >= 0
         if hasattr(x, '_mpc_'):
             return not x.imag and ctx.isnpint(x.real)
-        if type(x) in int_types:
-            return x <= 0
         if isinstance(x, ctx.mpq):
+            # mpq values are stored in lowest terms with q > 0
             p, q = x._mpq_
-            if not p:
-                return True
             return q == 1 and p <= 0
         return ctx.isnpint(ctx.convert(x))
 
@@ -421,14 +525,14 @@ def extraprec(ctx, n, normalize_output=False):
         normalize_output=True, it rounds the return value to the parent
         precision.
         """
-        return PrecisionManager(ctx, lambda p: p + n, None, normalize_output)
+        return _ExtraPrecManager(ctx, n, normalize_output)
 
     def extradps(ctx, n, normalize_output=False):
         """
         This function is analogous to extraprec (see documentation)
         but changes the decimal precision instead of the number of bits.
         """
-        return PrecisionManager(ctx, None, lambda d: d + n, normalize_output)
+        return _ExtraDpsManager(ctx, n, normalize_output)
 
     def workprec(ctx, n, normalize_output=False):
         """
@@ -445,14 +549,14 @@ def workprec(ctx, n, normalize_output=False):
         and restores the precision afterwards. With normalize_output=True,
         it rounds the return value to the parent precision.
         """
-        return PrecisionManager(ctx, lambda p: n, None, normalize_output)
+        return _WorkPrecManager(ctx, n, normalize_output)
 
     def workdps(ctx, n, normalize_output=False):
         """
         This function is analogous to workprec (see documentation)
         but changes the decimal precision instead of the number of bits.
         """
-        return PrecisionManager(ctx, None, lambda d: n, normalize_output)
+        return _WorkDpsManager(ctx, n, normalize_output)
 
     def autoprec(ctx, f, maxprec=None, catch=(), verbose=False):
         r"""
@@ -601,10 +705,14 @@ def nstr(ctx, x, n=6, **kwargs):
             '0.0e+0'
 
         """
-        if isinstance(x, list):
-            return "[%s]" % (", ".join(ctx.nstr(c, n, **kwargs) for c in x))
-        if isinstance(x, tuple):
-            return "(%s)" % (", ".join(ctx.nstr(c, n, **kwargs) for c in x))
+        if isinstance(x, (list, tuple)):
+            # Format real elements directly, without recursing
+            mpf = ctx.mpf
+            parts = [to_str(c._mpf_, n, **kwargs) if type(c) is mpf
+                else ctx.nstr(c, n, **kwargs) for c in x]
+            if isinstance(x, list):
+                return "[%s]" % ", ".join(parts)
+            return "(%s)" % ", ".join(parts)
         if hasattr(x, '_mpf_'):
             return to_str(x._mpf_, n, **kwargs)
         if hasattr(x, '_mpc_'):
@@ -617,13 +725,16 @@ def nstr(ctx, x, n=6, **kwargs):
 
     def _convert_fallback(ctx, x, strings):
         if strings and isinstance(x, basestring):
-            if 'j' in x.lower():
-                x = x.lower().replace(' ', '')
-                match = get_complex.match(x)
-                re = match.group('re')
+            s = x.lower()
+            if 'j' in s:
+                s = s.replace(' ', '')
+                parts = _parse_complex(s)
+                if parts is None:
+                    raise ValueError("cannot create mpc from " + repr(x))
+                re, im = parts
                 if not re:
                     re = 0
-                im = match.group('im').rstrip('j')
+                im = im.rstrip('j')
                 return ctx.mpc(ctx.convert(re), ctx.convert(im))
         if hasattr(x, "_mpi_"):
             a, b = x._mpi_
@@ -670,9 +781,10 @@ def hypsum(ctx, p, q, flags, coeffs, z, accurate_small=True, **kwargs):
         elif hasattr(z, "_mpc_"):
             key = p, q, flags, 'C'
             v = z._mpc_
-        if key not in ctx.hyp_summators:
-            ctx.hyp_summators[key] = libmp.make_hyp_summator(key)[1]
-        summator = ctx.hyp_summators[key]
+        summator = ctx.hyp_summators.get(key)
+        if summator is None:
+            summator = libmp.make_hyp_summator(key)[1]
+            ctx.hyp_summators[key] = summator
         prec = ctx.prec
         maxprec = kwargs.get('maxprec', ctx._default_hyper_maxprec(prec))
         extraprec = 50
@@ -682,18 +794,19 @@ def hypsum(ctx, p, q, flags, coeffs, z, accurate_small=True, **kwargs):
         # the sum and added accurately
         magnitude_check = {}
         max_total_jump = 0
+        nint_distance = ctx.nint_distance
         for i, c in enumerate(coeffs):
             if flags[i] == 'Z':
                 if i >= p and c <= 0:
                     ok = False
-                    for ii, cc in enumerate(coeffs[:p]):
+                    for ff, cc in zip(flags[:p], coeffs[:p]):
                         # Note: c <= cc or c < cc, depending on convention
-                        if flags[ii] == 'Z' and cc <= 0 and c <= cc:
+                        if ff == 'Z' and cc <= 0 and c <= cc:
                             ok = True
                     if not ok:
                         raise ZeroDivisionError("pole in hypergeometric series")
                 continue
-            n, d = ctx.nint_distance(c)
+            n, d = nint_distance(c)
             n = -int(n)
             d = -d
             if i >= p and n >= 0 and d > 4:
@@ -708,7 +821,7 @@ def hypsum(ctx, p, q, flags, coeffs, z, accurate_small=True, **kwargs):
                 raise ValueError(ctx._hypsum_msg % (prec, prec+extraprec))
             wp = prec + extraprec
             if magnitude_check:
-                mag_dict = dict((n,None) for n in magnitude_check)
+                mag_dict = dict.fromkeys(magnitude_check)
             else:
                 mag_dict = {}
             zv, have_complex, magnitude = summator(coeffs, v, prec, wp, \
@@ -762,7 +875,8 @@ def ldexp(ctx, x, n):
             mpf('0.125')
 
         """
-        x = ctx.convert(x)
+        if type(x) is not ctx.mpf:
+            x = ctx.convert(x)
         return ctx.make_mpf(libmp.mpf_shift(x._mpf_, n))
 
     def frexp(ctx, x):
@@ -777,7 +891,8 @@ def frexp(ctx, x):
             (mpf('0.9375'), 3)
 
         """
-        x = ctx.convert(x)
+        if type(x) is not ctx.mpf:
+            x = ctx.convert(x)
         y, n = libmp.mpf_frexp(x._mpf_)
         return ctx.make_mpf(y), n
 
@@ -828,9 +943,15 @@ def fneg(ctx, x, **kwargs):
 
         """
         prec, rounding = ctx._parse_prec(kwargs)
-        x = ctx.convert(x)
+        if type(x) is not ctx.mpf:
+            x = ctx.convert(x)
         if hasattr(x, '_mpf_'):
-            return ctx.make_mpf(mpf_neg(x._mpf_, prec, rounding))
+            val = mpf_neg(x._mpf_, prec, rounding)
+            if _inline_new:
+                v = new(ctx.mpf)
+                v._mpf_ = val
+                return v
+            return ctx.make_mpf(val)
         if hasattr(x, '_mpc_'):
             return ctx.make_mpc(mpc_neg(x._mpc_, prec, rounding))
         raise ValueError("Arguments need to be mpf or mpc compatible numbers")
@@ -892,12 +1013,19 @@ def fadd(ctx, x, y, **kwargs):
 
         """
         prec, rounding = ctx._parse_prec(kwargs)
-        x = ctx.convert(x)
-        y = ctx.convert(y)
+        mpf = ctx.mpf
+        if type(x) is not mpf or type(y) is not mpf:
+            x = ctx.convert(x)
+            y = ctx.convert(y)
         try:
             if hasattr(x, '_mpf_'):
                 if hasattr(y, '_mpf_'):
-                    return ctx.make_mpf(mpf_add(x._mpf_, y._mpf_, prec, rounding))
+                    val = mpf_add(x._mpf_, y._mpf_, prec, rounding)
+                    if _inline_new:
+                        v = new(mpf)
+                        v._mpf_ = val
+                        return v
+                    return ctx.make_mpf(val)
                 if hasattr(y, '_mpc_'):
                     return ctx.make_mpc(mpc_add_mpf(y._mpc_, x._mpf_, prec, rounding))
             if hasattr(x, '_mpc_'):
@@ -958,12 +1086,19 @@ def fsub(ctx, x, y, **kwargs):
 
         """
         prec, rounding = ctx._parse_prec(kwargs)
-        x = ctx.convert(x)
-        y = ctx.convert(y)
+        mpf = ctx.mpf
+        if type(x) is not mpf or type(y) is not mpf:
+            x = ctx.convert(x)
+            y = ctx.convert(y)
         try:
             if hasattr(x, '_mpf_'):
                 if hasattr(y, '_mpf_'):
-                    return ctx.make_mpf(mpf_sub(x._mpf_, y._mpf_, prec, rounding))
+                    val = mpf_sub(x._mpf_, y._mpf_, prec, rounding)
+                    if _inline_new:
+                        v = new(mpf)
+                        v._mpf_ = val
+                        return v
+                    return ctx.make_mpf(val)
                 if hasattr(y, '_mpc_'):
                     return ctx.make_mpc(mpc_sub((x._mpf_, fzero), y._mpc_, prec, rounding))
             if hasattr(x, '_mpc_'):
@@ -1027,12 +1162,19 @@ def fmul(ctx, x, y, **kwargs):
 
         """
         prec, rounding = ctx._parse_prec(kwargs)
-        x = ctx.convert(x)
-        y = ctx.convert(y)
+        mpf = ctx.mpf
+        if type(x) is not mpf or type(y) is not mpf:
+            x = ctx.convert(x)
+            y = ctx.convert(y)
         try:
             if hasattr(x, '_mpf_'):
                 if hasattr(y, '_mpf_'):
-                    return ctx.make_mpf(mpf_mul(x._mpf_, y._mpf_, prec, rounding))
+                    val = mpf_mul(x._mpf_, y._mpf_, prec, rounding)
+                    if _inline_new:
+                        v = new(mpf)
+                        v._mpf_ = val
+                        return v
+                    return ctx.make_mpf(val)
                 if hasattr(y, '_mpc_'):
                     return ctx.make_mpc(mpc_mul_mpf(y._mpc_, x._mpf_, prec, rounding))
             if hasattr(x, '_mpc_'):
@@ -1096,6 +1238,14 @@ def fdiv(ctx, x, y, **kwargs):
         prec, rounding = ctx._parse_prec(kwargs)
         if not prec:
             raise ValueError("division is not an exact operation")
+        mpf = ctx.mpf
+        if type(x) is mpf and type(y) is mpf:
+            val = mpf_div(x._mpf_, y._mpf_, prec, rounding)
+            if _inline_new:
+                v = new(mpf)
+                v._mpf_ = val
+                return v
+            return ctx.make_mpf(val)
         x = ctx.convert(x)
         y = ctx.convert(y)
         if hasattr(x, '_mpf_'):
@@ -1156,7 +1306,7 @@ def nint_distance(ctx, x):
             # log(p/q-n) = log((p-nq)/q) = log(p-nq) - log(q)
             d = bitcount(abs(p-n*q)) - bitcount(q)
             return n, d
-        if hasattr(x, "_mpf_"):
+        if typx is ctx.mpf or hasattr(x, "_mpf_"):
             re = x._mpf_
             im_dist = ctx.ninf
         elif hasattr(x, "_mpc_"):
@@ -1220,11 +1370,28 @@ def fprod(ctx, factors):
             mpf('7.0')
 
         """
+        if type(factors) not in (list, tuple):
+            factors = list(factors)
+        # Multiply with enough guard bits that only the final rounding
+        # matters, whatever the types of the factors (constants are
+        # also evaluated at the working precision)
+        prec, rounding = ctx._prec_rounding
+        wp = prec + bitcount(len(factors)) + 10
         orig = ctx.prec
         try:
-            v = ctx.one
-            for p in factors:
-                v *= p
+            ctx.prec = wp
+            # Fast path for real mpmath numbers: multiply the raw values
+            try:
+                real = [p._mpf_ for p in factors]
+            except AttributeError:
+                v = ctx.one
+                for p in factors:
+                    v *= p
+            else:
+                v = fone
+                for t in real:
+                    v = mpf_mul(v, t, wp, rounding)
+                return ctx.make_mpf(mpf_pos(v, prec, rounding))
         finally:
             ctx.prec = orig
         return +v
@@ -1304,15 +1471,19 @@ def __init__(self, ctx, precfun, dpsfun, normalize_output=False):
         self.precfun = precfun
         self.dpsfun = dpsfun
         self.normalize_output = normalize_output
+    def _set_precision(self):
+        if self.precfun:
+            self.ctx.prec = self.precfun(self.ctx.prec)
+        else:
+            self.ctx.dps = self.dpsfun(self.ctx.dps)
     def __call__(self, f):
         @functools.wraps(f)
         def g(*args, **kwargs):
-            orig = self.ctx.prec
+            ctx = self.ctx
+            prec = ctx.prec
+            dps = ctx.dps
             try:
-                if self.precfun:
-                    self.ctx.prec = self.precfun(self.ctx.prec)
-                else:
-                    self.ctx.dps = self.dpsfun(self.ctx.dps)
+                self._set_precision()
                 if self.normalize_output:
                     v = f(*args, **kwargs)
                     if type(v) is tuple:
@@ -1321,18 +1492,44 @@ def g(*args, **kwargs):
                 else:
                     return f(*args, **kwargs)
             finally:
-                self.ctx.prec = orig
+                ctx._set_prec_dps(prec, dps)
         return g
     def __enter__(self):
-        self.origp = self.ctx.prec
-        if self.precfun:
-            self.ctx.prec = self.precfun(self.ctx.prec)
-        else:
-            self.ctx.dps = self.dpsfun(self.ctx.dps)
+        ctx = self.ctx
+        self.origp = ctx.prec
+        self.origd = ctx.dps
+        self._set_precision()
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.ctx.prec = self.origp
+        self.ctx._set_prec_dps(self.origp, self.origd)
         return False
 
+# Specialized managers used by extraprec, extradps, workprec and workdps,
+# which store n directly instead of wrapping it in a lambda. The saved
+# precision is restored as a (prec, dps) pair (see MPContext._set_prec_dps
+# for the sage backend). The new precision always goes through the
+# prec/dps setters, which do the clamping.
+
+class _FixedPrecisionManager(PrecisionManager):
+    def __init__(self, ctx, n, normalize_output=False):
+        self.ctx = ctx
+        self.n = n
+        self.normalize_output = normalize_output
+
+class _ExtraPrecManager(_FixedPrecisionManager):
+    def _set_precision(self):
+        self.ctx.prec += self.n
+
+class _ExtraDpsManager(_FixedPrecisionManager):
+    def _set_precision(self):
+        self.ctx.dps += self.n
+
+class _WorkPrecManager(_FixedPrecisionManager):
+    def _set_precision(self):
+        self.ctx.prec = self.n
+
+class _WorkDpsManager(_FixedPrecisionManager):
+    def _set_precision(self):
+        self.ctx.dps = self.n
 
 if __name__ == '__main__':
     import doctest
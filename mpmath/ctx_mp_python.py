@@ -12,7 +12,7 @@
     mpf_div, mpf_rdiv_int, mpf_pow_int, mpf_mod,
     mpf_eq, mpf_cmp, mpf_lt, mpf_gt, mpf_le, mpf_ge,
     mpf_hash, mpf_rand,
-    mpf_sum,
+    mpf_sum, mpf_shift,
     bitcount, to_fixed,
     mpc_to_str,
     mpc_to_complex, mpc_hash, mpc_pos, mpc_is_nonzero, mpc_neg, mpc_conjugate,
@@ -30,6 +30,12 @@
 
 new = object.__new__
 
+# Exact conversions for the most common argument types of mpf_convert_arg
+# and mpf_convert_rhs, looked up by exact type; other types (including
+# subclasses of these) go through the general isinstance/hasattr checks.
+_convert_table = dict.fromkeys(int_types, from_int)
+_convert_table[float] = from_float
+
 class mpnumeric(object):
     """Base class for mpf and mpc."""
     __slots__ = []
@@ -59,7 +65,11 @@ def __new__(cls, val=fzero, **kwargs):
             if (not man) and exp:
                 return val
             v = new(cls)
-            v._mpf_ = normalize(sign, man, exp, bc, prec, rounding)
+            if bc <= prec:
+                # Already fits; share the (immutable) tuple
+                v._mpf_ = val._mpf_
+            else:
+                v._mpf_ = normalize(sign, man, exp, bc, prec, rounding)
             return v
         elif type(val) is tuple:
             if len(val) == 2:
@@ -75,16 +85,22 @@ def __new__(cls, val=fzero, **kwargs):
                 return v
             raise ValueError
         else:
+            val = cls.mpf_convert_arg(val, prec, rounding)
+            # Converted values are normalized, so only rounding remains
+            if val[3] > prec:
+                val = mpf_pos(val, prec, rounding)
             v = new(cls)
-            v._mpf_ = mpf_pos(cls.mpf_convert_arg(val, prec, rounding), prec, rounding)
+            v._mpf_ = val
             return v
 
     @classmethod
     def mpf_convert_arg(cls, x, prec, rounding):
+        f = _convert_table.get(type(x))
+        if f is not None: return f(x)
         if isinstance(x, int_types): return from_int(x)
         if isinstance(x, float): return from_float(x)
         if isinstance(x, basestring): return from_str(x, prec, rounding)
-        if isinstance(x, cls.context.constant): return x.func(prec, rounding)
+        if isinstance(x, cls.context.constant): return x._value(prec, rounding)
         if hasattr(x, '_mpf_'): return x._mpf_
         if hasattr(x, '_mpmath_'):
             t = cls.context.convert(x._mpmath_(prec, rounding))
@@ -99,6 +115,8 @@ def mpf_convert_arg(cls, x, prec, rounding):
 
     @classmethod
     def mpf_convert_rhs(cls, x):
+        f = _convert_table.get(type(x))
+        if f is not None: return f(x)
         if isinstance(x, int_types): return from_int(x)
         if isinstance(x, float): return from_float(x)
         if isinstance(x, complex_types): return cls.context.mpc(x)
@@ -235,17 +253,20 @@ def __round__(self, *args):
 
 mpf_binary_op = """
 def %NAME%(self, other):
-    mpf, new, (prec, rounding) = self._ctxdata
+    %CTXDATA%
     sval = self._mpf_
-    if hasattr(other, '_mpf_'):
+    ttype = type(other)
+    if ttype is mpf:
         tval = other._mpf_
         %WITH_MPF%
-    ttype = type(other)
     if ttype in int_types:
         %WITH_INT%
     elif ttype is float:
         tval = from_float(other)
         %WITH_MPF%
+    elif hasattr(other, '_mpf_'):
+        tval = other._mpf_
+        %WITH_MPF%
     elif hasattr(other, '_mpc_'):
         tval = other._mpc_
         mpc = type(other)
@@ -257,7 +278,7 @@ def %NAME%(self, other):
     if isinstance(other, mpnumeric):
         return NotImplemented
     try:
-        other = mpf.context.convert(other, strings=False)
+        other = self.context.convert(other, strings=False)
     except TypeError:
         return NotImplemented
     return self.%NAME%(other)
@@ -276,8 +297,17 @@ def %NAME%(self, other):
             val = mpc_pow((sval, fzero), (tval, fzero), prec, rounding) %s
 """ % (return_mpf, return_mpc)
 
-def binary_op(name, with_mpf='', with_int='', with_mpc=''):
+# Operations that only compare their operands (and never create a new
+# number) don't need the context data; the exact-type fast path tests
+# against the type of self. A constant on the left takes the generic
+# _mpf_ branch instead.
+ctxdata_full = "mpf, new, (prec, rounding) = self._ctxdata"
+ctxdata_type = "mpf = type(self)"
+
+def binary_op(name, with_mpf='', with_int='', with_mpc='',
+        ctxdata=ctxdata_full):
     code = mpf_binary_op
+    code = code.replace("%CTXDATA%", ctxdata)
     code = code.replace("%WITH_INT%", with_int)
     code = code.replace("%WITH_MPC%", with_mpc)
     code = code.replace("%WITH_MPF%", with_mpf)
@@ -289,7 +319,8 @@ def binary_op(name, with_mpf='', with_int='', with_mpc=''):
 _mpf.__eq__ = binary_op('__eq__',
     'return mpf_eq(sval, tval)',
     'return mpf_eq(sval, from_int(other))',
-    'return (tval[1] == fzero) and mpf_eq(tval[0], sval)')
+    'return (tval[1] == fzero) and mpf_eq(tval[0], sval)',
+    ctxdata_type)
 
 _mpf.__add__ = binary_op('__add__',
     'val = mpf_add(sval, tval, prec, rounding)' + return_mpf,
@@ -338,19 +369,38 @@ def __new__(cls, func, name, docname=''):
         a.name = name
         a.func = func
         a.__doc__ = getattr(function_docs, docname, '')
+        a._cache = {}
         return a
 
+    # Number of (prec, rounding) values remembered per constant
+    _cache_size = 4
+
+    def _value(self, prec, rounding):
+        """Return self.func(prec, rounding), caching the last few values
+        so that repeated use at a fixed precision is a dict lookup."""
+        cache = self._cache
+        key = prec, rounding
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        v = self.func(prec, rounding)
+        if len(cache) >= self._cache_size:
+            del cache[next(iter(cache))]
+        cache[key] = v
+        return v
+
     def __call__(self, prec=None, dps=None, rounding=None):
         prec2, rounding2 = self.context._prec_rounding
         if not prec: prec = prec2
         if not rounding: rounding = rounding2
         if dps: prec = dps_to_prec(dps)
-        return self.context.make_mpf(self.func(prec, rounding))
+        return self.context.make_mpf(self._value(prec, rounding))
 
     @property
     def _mpf_(self):
         prec, rounding = self.context._prec_rounding
-        return self.func(prec, rounding)
+        return self._value(prec, rounding)
 
     def __repr__(self):
         return "<%s: %s~>" % (self.name, self.context.nstr(self(dps=15)))
@@ -367,14 +417,28 @@ class behaves fairly similarly to Python's complex type.
 
     def __new__(cls, real=0, imag=0):
         s = object.__new__(cls)
+        mpf = cls.context.mpf
+        if type(real) is cls:
+            # Copy, rounding the parts only if they exceed the precision
+            re, im = real._mpc_
+            prec, rounding = cls.context._prec_rounding
+            if re[3] > prec or im[3] > prec:
+                re = mpf_pos(re, prec, rounding)
+                im = mpf_pos(im, prec, rounding)
+            s._mpc_ = (re, im)
+            return s
         if isinstance(real, complex_types):
             real, imag = real.real, real.imag
-        elif hasattr(real, '_mpc_'):
+        elif type(real) is not mpf and hasattr(real, '_mpc_'):
             s._mpc_ = real._mpc_
             return s
-        real = cls.context.mpf(real)
-        imag = cls.context.mpf(imag)
-        s._mpc_ = (real._mpf_, imag._mpf_)
+        re = mpf(real)._mpf_
+        # Avoid creating an mpf for the (default) zero imaginary part
+        if type(imag) in int_types and not imag:
+            im = fzero
+        else:
+            im = mpf(imag)._mpf_
+        s._mpc_ = (re, im)
         return s
 
     real = property(lambda self: self.context.make_mpf(self._mpc_[0]))
@@ -579,6 +643,18 @@ def ae(s, t, rel_eps=None, abs_eps=None):
 
 complex_types = (complex, _mpc)
 
+specfun_wrapper = """
+def f_wrapped(ctx%PARAMS%, **kwargs):
+    _convert = ctx.convert
+%CONVERT%    _prec = ctx.prec
+    try:
+        ctx.prec += 10
+        _retval = _f(ctx%PARAMS%, **kwargs)
+    finally:
+        ctx.prec = _prec
+    return +_retval
+"""
+
 
 class PythonMPContext(object):
 
@@ -586,12 +662,12 @@ def __init__(ctx):
         ctx._prec_rounding = [53, round_nearest]
         ctx.mpf = type('mpf', (_mpf,), {})
         ctx.mpc = type('mpc', (_mpc,), {})
-        ctx.mpf._ctxdata = [ctx.mpf, new, ctx._prec_rounding]
-        ctx.mpc._ctxdata = [ctx.mpc, new, ctx._prec_rounding]
+        ctx.mpf._ctxdata = (ctx.mpf, new, ctx._prec_rounding)
+        ctx.mpc._ctxdata = (ctx.mpc, new, ctx._prec_rounding)
         ctx.mpf.context = ctx
         ctx.mpc.context = ctx
         ctx.constant = type('constant', (_constant,), {})
-        ctx.constant._ctxdata = [ctx.mpf, new, ctx._prec_rounding]
+        ctx.constant._ctxdata = (ctx.mpf, new, ctx._prec_rounding)
         ctx.constant.context = ctx
 
     def make_mpf(ctx, v):
@@ -610,12 +686,24 @@ def default(ctx):
         ctx.trap_complex = False
 
     def _set_prec(ctx, n):
-        ctx._prec = ctx._prec_rounding[0] = max(1, int(n))
+        p = int(n)
+        if p < 1:
+            p = 1
+        ctx._prec = ctx._prec_rounding[0] = p
         ctx._dps = prec_to_dps(n)
 
     def _set_dps(ctx, n):
+        d = int(n)
+        if d < 1:
+            d = 1
         ctx._prec = ctx._prec_rounding[0] = dps_to_prec(n)
-        ctx._dps = max(1, int(n))
+        ctx._dps = d
+
+    def _set_prec_dps(ctx, prec, dps):
+        # Set a consistent (prec, dps) pair, e.g. one saved earlier,
+        # without converting between the two
+        ctx._prec = ctx._prec_rounding[0] = prec
+        ctx._dps = dps
 
     prec = property(lambda ctx: ctx._prec, _set_prec)
     dps = property(lambda ctx: ctx._dps, _set_dps)
@@ -655,7 +743,10 @@ def convert(ctx, x, strings=True):
         if isinstance(x, rational.mpq):
             p, q = x._mpq_
             return ctx.make_mpf(from_rational(p, q, prec))
-        if strings and isinstance(x, basestring):
+        # Complex literals are handled by _convert_fallback; don't try
+        # (and fail) to parse them as real numbers first
+        if strings and isinstance(x, basestring) and \
+            'j' not in x and 'J' not in x:
             try:
                 _mpf_ = from_str(x, prec, rounding)
                 return ctx.make_mpf(_mpf_)
@@ -730,6 +821,11 @@ def isinf(ctx, x):
             True
 
         """
+        t = type(x)
+        if t is ctx.mpf:
+            return x._mpf_ in (finf, fninf)
+        if t in int_types:
+            return False
         if hasattr(x, "_mpf_"):
             return x._mpf_ in (finf, fninf)
         if hasattr(x, "_mpc_"):
@@ -807,6 +903,12 @@ def isint(ctx, x, gaussian=False):
             True
 
         """
+        if type(x) is ctx.mpf:
+            # Mantissas are odd, so the value is an integer iff exp >= 0
+            sign, man, exp, bc = x._mpf_
+            if man:
+                return exp >= 0
+            return not exp
         if isinstance(x, int_types):
             return True
         if hasattr(x, "_mpf_"):
@@ -846,16 +948,34 @@ def fsum(ctx, terms, absolute=False, squared=False):
         the absolute value of each term is used.
         """
         prec, rnd = ctx._prec_rounding
+        if not (absolute or squared) and type(terms) in (list, tuple):
+            # Fast path for a sequence of real mpmath numbers
+            try:
+                real = [term._mpf_ for term in terms]
+            except AttributeError:
+                pass
+            else:
+                return ctx.make_mpf(mpf_sum(real, prec, rnd))
         real = []
         imag = []
+        mpf = ctx.mpf
+        mpc = ctx.mpc
+        convert = ctx.convert
         for term in terms:
             reval = imval = 0
-            if hasattr(term, "_mpf_"):
+            t = type(term)
+            if t is mpf:
+                reval = term._mpf_
+            elif t is mpc:
+                reval, imval = term._mpc_
+            elif t in _convert_table:
+                reval = _convert_table[t](term)
+            elif hasattr(term, "_mpf_"):
                 reval = term._mpf_
             elif hasattr(term, "_mpc_"):
                 reval, imval = term._mpc_
             else:
-                term = ctx.convert(term)
+                term = convert(term)
                 if hasattr(term, "_mpf_"):
                     reval = term._mpf_
                 elif hasattr(term, "_mpc_"):
@@ -868,9 +988,10 @@ def fsum(ctx, terms, absolute=False, squared=False):
                         real.append(mpf_mul(reval,reval))
                         real.append(mpf_mul(imval,imval))
                     else:
-                        reval, imval = mpc_pow_int((reval,imval),2,prec+10)
-                        real.append(reval)
-                        imag.append(imval)
+                        # (a+bi)^2 = a^2 - b^2 + 2abi, summed exactly
+                        real.append(mpf_mul(reval,reval))
+                        real.append(mpf_neg(mpf_mul(imval,imval)))
+                        imag.append(mpf_shift(mpf_mul(reval,imval), 1))
                 elif absolute:
                     real.append(mpc_abs((reval,imval), prec))
                 else:
@@ -928,23 +1049,39 @@ def fdot(ctx, A, B=None, conjugate=False):
             mpc(real='3.5', imag='-5.0')
 
         """
+        prec, rnd = ctx._prec_rounding
+        if type(A) in (list, tuple) and type(B) in (list, tuple):
+            # Fast path for two sequences of real mpmath numbers
+            try:
+                real = [mpf_mul(a._mpf_, b._mpf_) for a, b in zip(A, B)]
+            except AttributeError:
+                pass
+            else:
+                return ctx.make_mpf(mpf_sum(real, prec, rnd))
         if B is not None:
             A = zip(A, B)
-        prec, rnd = ctx._prec_rounding
         real = []
         imag = []
         hasattr_ = hasattr
-        types = (ctx.mpf, ctx.mpc)
+        mpf = ctx.mpf
+        mpc = ctx.mpc
+        convert = ctx.convert
         for a, b in A:
-            if type(a) not in types: a = ctx.convert(a)
-            if type(b) not in types: b = ctx.convert(b)
-            a_real = hasattr_(a, "_mpf_")
-            b_real = hasattr_(b, "_mpf_")
+            ta = type(a)
+            if ta is not mpf and ta is not mpc:
+                a = convert(a)
+                ta = type(a)
+            tb = type(b)
+            if tb is not mpf and tb is not mpc:
+                b = convert(b)
+                tb = type(b)
+            a_real = ta is mpf or (ta is not mpc and hasattr_(a, "_mpf_"))
+            b_real = tb is mpf or (tb is not mpc and hasattr_(b, "_mpf_"))
             if a_real and b_real:
                 real.append(mpf_mul(a._mpf_, b._mpf_))
                 continue
-            a_complex = hasattr_(a, "_mpc_")
-            b_complex = hasattr_(b, "_mpc_")
+            a_complex = ta is mpc or hasattr_(a, "_mpc_")
+            b_complex = tb is mpc or hasattr_(b, "_mpc_")
             if a_real and b_complex:
                 aval = a._mpf_
                 bre, bim = b._mpc_
@@ -997,12 +1134,15 @@ def f(x, **kwargs):
                 rounding = kwargs.get('rounding', rounding)
             if hasattr(x, '_mpf_'):
                 try:
-                    return ctx.make_mpf(mpf_f(x._mpf_, prec, rounding))
+                    val = mpf_f(x._mpf_, prec, rounding)
                 except ComplexResult:
                     # Handle propagation to complex
                     if ctx.trap_complex:
                         raise
                     return ctx.make_mpc(mpc_f((x._mpf_, fzero), prec, rounding))
+                v = new(ctx.mpf)
+                v._mpf_ = val
+                return v
             elif hasattr(x, '_mpc_'):
                 return ctx.make_mpc(mpc_f(x._mpc_, prec, rounding))
             raise NotImplementedError("%s of a %s" % (name, type(x)))
@@ -1013,7 +1153,20 @@ def f(x, **kwargs):
     # Called by SpecialFunctions.__init__()
     @classmethod
     def _wrap_specfun(cls, name, f, wrap):
-        if wrap:
+        code = f.__code__
+        # CO_VARARGS = 0x04
+        if wrap and not (code.co_flags & 0x04 or f.__defaults__):
+            # Fixed number of positional arguments: generate a wrapper
+            # that converts them one by one
+            params = code.co_varnames[1:code.co_argcount]
+            src = specfun_wrapper.replace("%PARAMS%", "".join(
+                ", " + a for a in params))
+            src = src.replace("%CONVERT%", "".join(
+                "    %s = _convert(%s)\n" % (a, a) for a in params))
+            np = {'_f': f}
+            exec_(src, np)
+            f_wrapped = np['f_wrapped']
+        elif wrap:
             def f_wrapped(ctx, *args, **kwargs):
                 convert = ctx.convert
                 args = [convert(a) for a in args]
@@ -1030,15 +1183,18 @@ def f_wrapped(ctx, *args, **kwargs):
         setattr(cls, name, f_wrapped)
 
     def _convert_param(ctx, x):
-        if hasattr(x, "_mpc_"):
+        t = type(x)
+        if t is ctx.mpf:
+            v = x._mpf_
+        elif t in int_types:
+            return int(x), 'Z'
+        elif t is ctx.mpc or hasattr(x, "_mpc_"):
             v, im = x._mpc_
             if im != fzero:
                 return x, 'C'
         elif hasattr(x, "_mpf_"):
             v = x._mpf_
         else:
-            if type(x) in int_types:
-                return int(x), 'Z'
             p = None
             if isinstance(x, tuple):
                 p, q = x
@@ -1110,9 +1266,19 @@ def mag(ctx, x):
 
         """
         if hasattr(x, "_mpf_"):
-            return ctx._mpf_mag(x._mpf_)
+            sign, man, exp, bc = v = x._mpf_
+            if man:
+                return exp+bc
+            return ctx._mpf_mag(v)
         elif hasattr(x, "_mpc_"):
             r, i = x._mpc_
+            if r[1] and i[1]:
+                # Both parts finite and nonzero
+                rmag = r[2]+r[3]
+                imag = i[2]+i[3]
+                if rmag > imag:
+                    return 1+rmag
+                return 1+imag
             if r == fzero:
                 return ctx._mpf_mag(i)
             if i == fzero:
@@ -7551,7 +7551,7 @@
     >>> cyclotomic(10, z)
     61.0
     >>> fprod(z-r for r in unitroots(10, primitive=True))
-    (61.0 - 3.146045605088568607055454e-25j)
+    (61.0 - 3.500200180634674671950368e-31j)
 
 Up to permutation, the roots of a given cyclotomic polynomial
 can be checked to agree with the list of primitive roots::
@@ -68,7 +68,8 @@
   mpi_gamma, mpci_gamma, mpi_loggamma, mpci_loggamma,
   mpi_rgamma, mpci_rgamma, mpi_factorial, mpci_factorial)
 
-from .libintmath import (trailing, bitcount, numeral, bin_to_radix,
+from .libintmath import (trailing, bitcount, toom3_mul, toom3_sqr, mpz_sqr,
+  numeral, bin_to_radix,
   isqrt, isqrt_small, isqrt_fast, sqrt_fixed, sqrtrem, ifib, ifac,
   list_primes, isprime, moebius, gcd, eulernum, stirling1, stirling2)
 
@@ -471,7 +471,9 @@ def mpf_bernoulli(n, prec, rnd=None):
         if m > 6:
             bin1 = bin1 * ((2+m)*(3+m)) // ((m-7)*(m-6))
         state[:] = [m, bin, bin1]
-    return numbers[n]
+    if not rnd:
+        return numbers[n]
+    return mpf_pos(numbers[n], prec, rnd)
 
 def mpf_bernoulli_huge(n, prec, rnd=None):
     wp = prec + 10
@@ -765,78 +767,95 @@ def mpc_psi0(z, prec, rnd=round_fast):
         k += 1
     return s
 
-# Currently unoptimized
-def mpf_psi(m, x, prec, rnd=round_fast):
-    """
-    Computation of the polygamma function of arbitrary integer order
-    m >= 0, for a real argument x.
-    """
-    if m == 0:
-        return mpf_psi0(x, prec, rnd=round_fast)
-    return mpc_psi(m, (x, fzero), prec, rnd)[0]
+# Arithmetic used by _psi_series for a real or a complex argument
+_psi_real_ops = (fzero, mpf_pow_int, mpf_add, mpf_add, mpf_mul, mpf_mul,
+    mpf_div, mpf_div, mpf_abs, mpf_neg)
+_psi_complex_ops = (mpc_zero, mpc_pow_int, mpc_add, mpc_add_mpf, mpc_mul,
+    mpc_mul_mpf, mpc_div, mpc_div_mpf, mpc_abs, mpc_neg)
 
-def mpc_psi(m, z, prec, rnd=round_fast):
+def _psi_series(m, z, w, prec, rnd, ops):
     """
-    Computation of the polygamma function of arbitrary integer order
-    m >= 0, for a complex argument z.
+    Polygamma function of order m >= 1 by recurrence up to a large
+    argument and the asymptotic (Euler-Maclaurin) series there. The
+    argument z is real or complex according to ops, and w = floor(re(z)).
     """
-    if m == 0:
-        return mpc_psi0(z, prec, rnd)
-    re, im = z
+    zero, pow_int, add, add_mpf, mul, mul_mpf, div, div_mpf, absval, neg = ops
     wp = prec + 20
-    sign, man, exp, bc = re
-    if not im[1]:
-        if im in (finf, fninf, fnan):
-            return (fnan, fnan)
-    if not man:
-        if re == finf and im == fzero:
-            return (fzero, fzero)
-        if re == fnan:
-            return (fnan, fnan)
     # Recurrence
-    w = to_int(re)
     n = int(0.4*wp + 4*m)
-    s = mpc_zero
+    s = zero
     if w < n:
         for k in xrange(w, n):
-            t = mpc_pow_int(z, -m-1, wp)
-            s = mpc_add(s, t, wp)
-            z = mpc_add_mpf(z, fone, wp)
-    zm = mpc_pow_int(z, -m, wp)
-    z2 = mpc_pow_int(z, -2, wp)
+            t = pow_int(z, -m-1, wp)
+            s = add(s, t, wp)
+            z = add_mpf(z, fone, wp)
+    zm = pow_int(z, -m, wp)
+    z2 = pow_int(z, -2, wp)
     # 1/m*(z+N)^m
-    integral_term = mpc_div_mpf(zm, from_int(m), wp)
-    s = mpc_add(s, integral_term, wp)
+    integral_term = div_mpf(zm, from_int(m), wp)
+    s = add(s, integral_term, wp)
     # 1/2*(z+N)^(-(m+1))
-    s = mpc_add(s, mpc_mul_mpf(mpc_div(zm, z, wp), fhalf, wp), wp)
+    s = add(s, mul_mpf(div(zm, z, wp), fhalf, wp), wp)
     a = m + 1
     b = 2
     k = 1
     # Important: we want to sum up to the *relative* error,
     # not the absolute error, because psi^(m)(z) might be tiny
-    magn = mpc_abs(s, 10)
+    magn = absval(s, 10)
     magn = magn[2]+magn[3]
     eps = mpf_shift(fone, magn-wp+2)
     while 1:
-        zm = mpc_mul(zm, z2, wp)
+        zm = mul(zm, z2, wp)
         bern = mpf_bernoulli(2*k, wp)
         scal = mpf_mul_int(bern, a, wp)
         scal = mpf_div(scal, from_int(b), wp)
-        term = mpc_mul_mpf(zm, scal, wp)
-        s = mpc_add(s, term, wp)
-        szterm = mpc_abs(term, 10)
+        term = mul_mpf(zm, scal, wp)
+        s = add(s, term, wp)
+        szterm = absval(term, 10)
         if k > 2 and mpf_le(szterm, eps):
             break
-        #print k, to_str(szterm, 10), to_str(eps, 10)
         a *= (m+2*k)*(m+2*k+1)
         b *= (2*k+1)*(2*k+2)
         k += 1
     # Scale and sign factor
-    v = mpc_mul_mpf(s, mpf_gamma(from_int(m+1), wp), prec, rnd)
+    v = mul_mpf(s, mpf_gamma(from_int(m+1), wp), prec, rnd)
     if not (m & 1):
-        v = mpf_neg(v[0]), mpf_neg(v[1])
+        v = neg(v)
     return v
 
+def mpf_psi(m, x, prec, rnd=round_fast):
+    """
+    Computation of the polygamma function of arbitrary integer order
+    m >= 0, for a real argument x.
+    """
+    if m == 0:
+        return mpf_psi0(x, prec, rnd=round_fast)
+    sign, man, exp, bc = x
+    if sign or not man:
+        return mpc_psi(m, (x, fzero), prec, rnd)[0]
+    # Positive real argument: the same series as mpc_psi, using real
+    # arithmetic throughout
+    return _psi_series(m, x, to_int(x), prec, rnd, _psi_real_ops)
+
+def mpc_psi(m, z, prec, rnd=round_fast):
+    """
+    Computation of the polygamma function of arbitrary integer order
+    m >= 0, for a complex argument z.
+    """
+    if m == 0:
+        return mpc_psi0(z, prec, rnd)
+    re, im = z
+    sign, man, exp, bc = re
+    if not im[1]:
+        if im in (finf, fninf, fnan):
+            return (fnan, fnan)
+    if not man:
+        if re == finf and im == fzero:
+            return (fzero, fzero)
+        if re == fnan:
+            return (fnan, fnan)
+    return _psi_series(m, z, to_int(re), prec, rnd, _psi_complex_ops)
+
 
 #-----------------------------------------------------------------------#
 #                                                                       #
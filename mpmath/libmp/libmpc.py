@@ -152,6 +152,23 @@ def mpc_mul(z, w, prec, rnd=round_fast):
     """
     a, b = z
     c, d = w
+    # If one factor is purely real or purely imaginary, two of the four
+    # products vanish exactly. This requires the other factor to be
+    # finite (bc >= 0), since infinities times zero must give nan.
+    # A zero mantissa flags both zeros and special values.
+    if not (a[1] and b[1] and c[1] and d[1]):
+        if a[3] >= 0 and b[3] >= 0:
+            if d == fzero:
+                return mpf_mul(a, c, prec, rnd), mpf_mul(b, c, prec, rnd)
+            if c == fzero:
+                return (mpf_mul(mpf_neg(b), d, prec, rnd),
+                    mpf_mul(a, d, prec, rnd))
+        if c[3] >= 0 and d[3] >= 0:
+            if b == fzero:
+                return mpf_mul(a, c, prec, rnd), mpf_mul(a, d, prec, rnd)
+            if a == fzero:
+                return (mpf_mul(mpf_neg(b), d, prec, rnd),
+                    mpf_mul(b, c, prec, rnd))
     p = mpf_mul(a, c)
     q = mpf_mul(b, d)
     r = mpf_mul(a, d)
@@ -194,6 +211,13 @@ def mpc_mul_int(z, n, prec, rnd=round_fast):
 def mpc_div(z, w, prec, rnd=round_fast):
     a, b = z
     c, d = w
+    # Dividing finite values by a purely real or purely imaginary
+    # (nonzero, finite) number only needs two real divisions
+    if not (c[1] and d[1]) and a[3] >= 0 and b[3] >= 0:
+        if d == fzero and c[1]:
+            return mpf_div(a, c, prec, rnd), mpf_div(b, c, prec, rnd)
+        if c == fzero and d[1]:
+            return mpf_div(b, d, prec, rnd), mpf_div(mpf_neg(a), d, prec, rnd)
     wp = prec + 10
     # mag = c*c + d*d
     mag = mpf_add(mpf_mul(c, c), mpf_mul(d, d), wp)
@@ -228,14 +252,20 @@ def mpc_mpf_div(p, z, prec, rnd=round_fast):
 def complex_int_pow(a, b, n):
     """Complex integer power: computes (a+b*I)**n exactly for
     nonnegative n (a and b must be Python ints)."""
-    wre = 1
-    wim = 0
+    if not n:
+        return 1, 0
+    # Skip the leading multiplications by 1
+    while not n & 1:
+        a, b = (a+b)*(a-b), 2*a*b
+        n >>= 1
+    wre, wim = a, b
+    n >>= 1
     while n:
+        # a^2 - b^2 = (a+b)*(a-b) saves one multiplication
+        a, b = (a+b)*(a-b), 2*a*b
         if n & 1:
             wre, wim = wre*a - wim*b, wim*a + wre*b
-            n -= 1
-        a, b = a*a - b*b, 2*a*b
-        n //= 2
+        n >>= 1
     return wre, wim
 
 def mpc_pow(z, w, prec, rnd=round_fast):
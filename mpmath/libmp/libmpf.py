@@ -19,8 +19,12 @@
 
 from .libintmath import (giant_steps,
     trailtable, bctable, lshift, rshift, bitcount, trailing,
+    toom3_mul, mpz_sqr,
     sqrt_fixed, numeral, isqrt, isqrt_fast, sqrtrem,
     bin_to_radix)
+# The Toom-3 threshold is read as libintmath.TOOM3_THRESHOLD, so that
+# changing it there takes effect here too
+from . import libintmath
 
 # We don't pickle tuples directly for the following reasons:
 #   1: pickle uses str() for ints, which is inefficient when they are large
@@ -56,24 +60,46 @@ class ComplexResult(ValueError):
 round_down = intern('d')
 round_fast = round_down
 
-def prec_to_dps(n):
+# The conversions between binary and decimal precision below are called
+# whenever the precision changes and for every string conversion. Only
+# a few distinct precisions occur in practice, so the results are cached
+# (up to a fixed number of entries, to bound memory use).
+_prec_cache_size = 1000
+
+def prec_to_dps(n, _cache={}):
     """Return number of accurate decimals that can be represented
     with a precision of n bits."""
-    return max(1, int(round(int(n)/3.3219280948873626)-1))
-
-def dps_to_prec(n):
+    dps = _cache.get(n)
+    if dps is None:
+        dps = max(1, int(round(int(n)/3.3219280948873626)-1))
+        if len(_cache) < _prec_cache_size:
+            _cache[n] = dps
+    return dps
+
+def dps_to_prec(n, _cache={}):
     """Return the number of bits required to represent n decimals
     accurately."""
-    return max(1, int(round((int(n)+1)*3.3219280948873626)))
+    prec = _cache.get(n)
+    if prec is None:
+        prec = max(1, int(round((int(n)+1)*3.3219280948873626)))
+        if len(_cache) < _prec_cache_size:
+            _cache[n] = prec
+    return prec
 
-def repr_dps(n):
+def repr_dps(n, _cache={}):
     """Return the number of decimal digits required to represent
     a number with n-bit precision so that it can be uniquely
     reconstructed from the representation."""
-    dps = prec_to_dps(n)
-    if dps == 15:
-        return 17
-    return dps + 3
+    dps = _cache.get(n)
+    if dps is None:
+        dps = prec_to_dps(n)
+        if dps == 15:
+            dps = 17
+        else:
+            dps += 3
+        if len(_cache) < _prec_cache_size:
+            _cache[n] = dps
+    return dps
 
 #----------------------------------------------------------------------------#
 #                    Some commonly needed float values                       #
@@ -886,7 +912,13 @@ def python_mpf_mul(s, t, prec=0, rnd=round_fast):
     ssign, sman, sexp, sbc = s
     tsign, tman, texp, tbc = t
     sign = ssign ^ tsign
-    man = sman*tman
+    if sbc > libintmath.TOOM3_THRESHOLD and tbc > libintmath.TOOM3_THRESHOLD:
+        if sman is tman:
+            man = mpz_sqr(sman)
+        else:
+            man = toom3_mul(sman, tman)
+    else:
+        man = sman*tman
     if man:
         bc = sbc + tbc - 1
         bc += int(man>>bc)
@@ -1061,7 +1093,10 @@ def mpf_pow_int(s, n, prec, rnd=round_fast):
         _, man, exp, bc = s
         if not man:
             return fzero
-        man = man*man
+        if bc > libintmath.TOOM3_THRESHOLD:
+            man = mpz_sqr(man)
+        else:
+            man = man*man
         if man == 1:
             return (0, MPZ_ONE, exp+exp, 1)
         bc = bc + bc - 2
@@ -1107,7 +1142,10 @@ def mpf_pow_int(s, n, prec, rnd=round_fast):
             n -= 1
             if not n:
                 break
-        man = man*man
+        if bc > libintmath.TOOM3_THRESHOLD:
+            man = mpz_sqr(man)
+        else:
+            man = man*man
         exp = exp+exp
         bc = bc + bc - 2
         bc = bc + bctable[int(man >> bc)]
@@ -1293,16 +1331,12 @@ def str_to_man_exp(x, base=10):
     # Verify that the input is a valid float literal
     float(x)
     # Split into mantissa, exponent
-    parts = x.split('e')
-    if len(parts) == 1:
-        exp = 0
-    else: # == 2
-        x = parts[0]
-        exp = int(parts[1])
+    x, _, exp = x.partition('e')
+    exp = int(exp) if exp else 0
     # Look for radix point in mantissa
-    parts = x.split('.')
-    if len(parts) == 2:
-        a, b = parts[0], parts[1].rstrip('0')
+    a, point, b = x.partition('.')
+    if point:
+        b = b.rstrip('0')
         exp -= len(b)
         x = a + b
     x = MPZ(int(x, base))
@@ -474,21 +474,21 @@ def mpi_from_str(s, prec):
     s = s.replace(" ", "")
     wp = prec + 20
     if "+-" in s:
-        x, y = s.split("+-")
-        return mpi_from_str_a_b(x, y, False, prec)
+        x, _, y = s.partition("+-")
+        percent = y[-1:] == "%"
+        if percent:
+            y = y[:-1]
+        return mpi_from_str_a_b(x, y, percent, prec)
     # case 2
     elif "(" in s:
+        x, _, y = s.partition("(")
         # Don't confuse with a complex number (x,y)
-        if s[0] == "(" or ")" not in s:
+        if not x or y[-1:] != ")":
             raise e
-        s = s.replace(")", "")
-        percent = False
-        if "%" in s:
-            if s[-1] != "%":
-                raise e
-            percent = True
-            s = s.replace("%", "")
-        x, y = s.split("(")
+        y = y[:-1]
+        percent = y[-1:] == "%"
+        if percent:
+            y = y[:-1]
         return mpi_from_str_a_b(x, y, percent, prec)
     elif "," in s:
         if ('[' not in s) or (']' not in s):
@@ -130,6 +130,19 @@ def test_complex_zeros():
                 for d in [0,5]:
                     assert mpc(a,b)*mpc(c,d) == complex(a,b)*complex(c,d)
 
+def test_complex_pure_parts():
+    z = mpc(2, 3)
+    assert z*mpc(0, 5) == mpc(-15, 10)
+    assert mpc(0, 5)*z == mpc(-15, 10)
+    assert z*mpc(5, 0) == mpc(10, 15)
+    assert z/mpc(0, 4) == mpc(0.75, -0.5)
+    assert z/mpc(4, 0) == mpc(0.5, 0.75)
+    # infinite parts must not be multiplied by zero silently
+    w = mpc(inf, 1)*mpc(0, 1)
+    assert isnan(w.real) and w.imag == inf
+    w = mpc(inf, inf)*mpc(2, 0)
+    assert isnan(w.real) and isnan(w.imag)
+
 def test_hash():
     for i in range(-256, 256):
         assert hash(mpf(i)) == hash(i)
@@ -368,6 +381,13 @@ def test_isnan_etc():
     assert isinf(mpc(nan,nan)) == False
     assert isinf(mpq((3,2))) == False
     assert isinf(mpq((0,1))) == False
+    assert isfinite(mpf(0)) == True
+    assert isfinite(mpf(-3.5)) == True
+    assert isfinite(inf) == False
+    assert isfinite(-inf) == False
+    assert isfinite(nan) == False
+    assert isfinite(mpc(3,inf)) == False
+    assert isfinite(3) == True
     assert isnormal(3) == True
     assert isnormal(3.5) == True
     assert isnormal(mpf(3.5)) == True
@@ -409,6 +429,9 @@ def test_isnan_etc():
     assert isint(nan) == False
     assert isint(inf) == False
     assert isint(-inf) == False
+    assert isint(ldexp(3, 1000)) == True
+    assert isint(ldexp(3, -1000)) == False
+    assert isint(pi) == False
     assert isint(mpc(0)) == True
     assert isint(mpc(3)) == True
     assert isint(mpc(3.2)) == False
@@ -438,14 +461,58 @@ def test_isnan_etc():
     assert mp.isnpint(mp.mpq(-3,1)) == True
     assert mp.isnpint(mp.mpq(0,1)) == True
     assert mp.isnpint(mp.mpq(1,1)) == False
+    assert mp.isnpint(mp.mpq(6,-3)) == True
+    assert mp.isnpint(mp.mpq(-10**50, 10**50+1)) == False
     assert mp.isnpint(0+0j) == True
     assert mp.isnpint(-1+0j) == True
     assert mp.isnpint(-1.1+0j) == False
     assert mp.isnpint(-1+0.1j) == False
     assert mp.isnpint(0+0.1j) == False
+    assert mp.isnpint(mpf(0)) == True
+    assert mp.isnpint(mpf(-4)) == True
+    assert mp.isnpint(mpf(-2.5)) == False
+    assert mp.isnpint(mpf(3)) == False
+    assert not mp.isnpint(inf)
+    assert not mp.isnpint(-inf)
+    assert not mp.isnpint(nan)
 
 
 def test_issue_438():
     assert mpf(finf) == mpf('inf')
     assert mpf(fninf) == mpf('-inf')
     assert mpf(fnan)._mpf_ == mpf('nan')._mpf_
+
+def test_precision_managers():
+    mp.prec = 53
+    with mp.extraprec(10):
+        assert mp.prec == 63
+        with mp.workprec(20):
+            assert mp.prec == 20
+        assert mp.prec == 63
+    with mp.workdps(30):
+        assert mp.dps == 30
+        with mp.extradps(5):
+            assert mp.dps == 35
+    assert mp.prec == 53
+    assert mp.extraprec(100)(lambda: mp.prec)() == 153
+    assert mp.workdps(30)(lambda: mp.dps)() == 30
+    assert mp.prec == 53
+    # prec and dps are both restored exactly
+    mp.dps = 20
+    with mp.workprec(100):
+        assert mp.dps == 29
+        with mp.workdps(10):
+            assert mp.prec == 37
+        assert (mp.prec, mp.dps) == (100, 29)
+    assert (mp.prec, mp.dps) == (70, 20)
+    assert mp.workprec(0)(lambda: (mp.prec, mp.dps))() == (1, 1)
+    assert mp.workdps(0)(lambda: (mp.prec, mp.dps))() == (3, 1)
+    mp.dps = 15
+
+def test_mag():
+    mp.dps = 15
+    assert mag(mpf(10)) == 4
+    assert mag(mpc(10, 1)) == mag(mpc(1, 10)) == 5
+    assert mag(mpc(0, 10)) == mag(mpc(10, 0)) == 4
+    assert mag(mpc(0, 0)) == -inf
+    assert mag(mpc(inf, 1)) == inf
@@ -22,6 +22,41 @@ def test_trailing():
     assert trailing(2**100) == 100
     assert trailing(2**100-1) == 0
 
+def test_toom3_mul():
+    for a, b in [(0, 3**50000), (3**50000, 1), (3**50000, 7**30000),
+                 (3**100000-1, 5**70000+1), (2**200000-1, 2**150000-1),
+                 (3**100000, 7**10000)]:
+        assert toom3_mul(a, b) == a*b
+        assert toom3_mul(b, a) == a*b
+    x = from_man_exp(3**100000, -10)
+    y = from_man_exp(7**60000, 5)
+    assert mpf_mul(x, y) == from_man_exp(3**100000 * 7**60000, -5)
+    assert mpf_mul(x, y, 500, round_down) == \
+        from_man_exp(3**100000 * 7**60000, -5, 500, round_down)
+
+def test_toom3_sqr():
+    for a in [0, 1, 3**50000, 3**100000-1, -(2**200000-1)]:
+        assert toom3_sqr(a) == mpz_sqr(a) == a*a
+    x = from_man_exp(3**100000, -10)
+    assert mpf_mul(x, x) == from_man_exp(3**200000, -20)
+    assert mpf_pow_int(x, 2, 200000) == mpf_mul(x, x, 200000)
+    assert mpf_pow_int(x, 5, 300000, round_down) == \
+        from_man_exp(3**500000, -50, 300000, round_down)
+
+def test_toom3_threshold():
+    # The threshold is read from libintmath at call time
+    from mpmath.libmp import libintmath
+    orig = libintmath.TOOM3_THRESHOLD
+    try:
+        libintmath.TOOM3_THRESHOLD = 100
+        x = from_man_exp(3**1000, -10)
+        y = from_man_exp(7**700, 5)
+        assert mpf_mul(x, y) == from_man_exp(3**1000 * 7**700, -5)
+        assert mpf_mul(x, x) == from_man_exp(3**2000, -20)
+        assert mpf_pow_int(x, 3, 5000) == from_man_exp(3**3000, -30)
+    finally:
+        libintmath.TOOM3_THRESHOLD = orig
+
 def test_round_down():
     assert from_man_exp(0, -4, 4, round_down)[:3] == (0, 0, 0)
     assert from_man_exp(0xf0, -4, 4, round_down)[:3] == (0, 15, 0)
@@ -1,4 +1,5 @@
 import random
+import pytest
 from mpmath import *
 from mpmath.libmp import *
 
@@ -196,6 +197,62 @@ def test_mpmathify():
     assert mpmathify('(1.0+1.0j)') == mpc(1, 1)
     assert mpmathify('(1.2e-10 - 3.4e5j)') == mpc('1.2e-10', '-3.4e5')
     assert mpmathify('1j') == mpc(1j)
+    assert mpmathify('2e-3+1e+2j') == mpc('2e-3', '1e+2')
+    assert mpmathify('-1e5j') == mpc(0, '-1e5')
+    assert mpmathify('(1.5 +2.5j') == mpc(1.5, 2.5)
+    for s in ['1.5.5j', '1+2+3j', '1e+j', '2j3']:
+        pytest.raises(ValueError, lambda: mpmathify(s))
+    # The message shows the argument as it was passed
+    with pytest.raises(ValueError, match=r"'1 \+ 2 \+ 3J'"):
+        mpmathify('1 + 2 + 3J')
+
+def test_mpf_rounding_on_construction():
+    x = mpf(1)/3
+    assert mpf(x)._mpf_ is x._mpf_
+    assert mpf(x, prec=10) == mpf(683)/2048
+    assert mpf(2**100+1, prec=53) == 2**100
+    assert mpf(2**100+1, prec=200) == 2**100+1
+
+def test_mpc_from_mpc():
+    z = mpc(1, 2)/3
+    assert mpc(z) == z
+    assert mpc(z, 5) == z
+    mp.prec = 10
+    try:
+        assert mpc(z) == mpc(mpf(1)/3, mpf(2)/3)
+    finally:
+        mp.prec = 53
+
+def test_from_float():
+    assert from_float(0.5) == (0, 1, -1, 1)
+    assert from_float(-6.0) == (1, 3, 1, 2)
+    assert from_float(0.0) == from_float(-0.0) == fzero
+    assert from_float(1e300*1e300) == finf
+    assert from_float(-1e300*1e300) == fninf
+    assert from_float((1e300*1e300)*0) == fnan
+    assert to_float(from_float(5e-324)) == 5e-324
+    assert to_float(from_float(1.7976931348623157e308)) == 1.7976931348623157e308
+    assert from_float(0.1, 10, round_floor) == from_man_exp(819, -13)
+    assert from_float(0.1, 10, round_ceiling) == from_man_exp(205, -11)
+    # Inputs other than float are converted to a float first
+    from fractions import Fraction
+    from decimal import Decimal
+    class F(float):
+        def as_integer_ratio(self):
+            return (1, 3)
+    assert from_float(F(0.1)) == from_float(0.1)
+    assert from_float(F('inf')) == finf
+    assert from_float(3) == from_int(3)
+    assert from_float(2**60+1) == from_float(float(2**60+1))
+    assert from_float(Fraction(1, 10)) == from_float(0.1)
+    assert from_float(Decimal('0.1')) == from_float(0.1)
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    assert from_float(np.float64(0.1)) == from_float(0.1)
+    assert from_float(np.float32(0.1)) == from_float(float(np.float32(0.1)))
+    assert from_float(np.float64('nan')) == fnan
 
 def test_issue548():
     try:
@@ -64,6 +64,17 @@ def test_constants():
     assert pi > 3
     assert pi < 4
 
+def test_constants_cache():
+    mp.dps = 15
+    a = +pi
+    for prec in [10, 53, 100, 200, 300, 53, 10]:
+        mp.prec = prec
+        assert +pi == mpf(tpi)
+        assert pi(rounding='u') > pi(rounding='d')
+        assert len(pi._cache) <= pi._cache_size
+    mp.dps = 15
+    assert +pi == a
+
 def test_exact_sqrts():
     for i in range(20000):
         assert sqrt(mpf(i*i)) == i
@@ -252,6 +263,14 @@ def test_complex_powers():
     assert (e**(-pi*1j)).ae(-1)
     mp.dps = 15
 
+def test_complex_int_powers():
+    for n in range(20):
+        w = mpc(1)
+        for k in range(n):
+            w *= mpc(3, -2)
+        assert mpc(3, -2)**n == w
+    assert mpc(3, -2)**-2 == 1/mpc(5, -12)
+
 def test_complex_sqrt_accuracy():
     def test_mpc_sqrt(lst):
         for a, b in lst:
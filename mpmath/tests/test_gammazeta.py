@@ -1,5 +1,6 @@
 from mpmath import *
-from mpmath.libmp import round_up, from_float, mpf_zeta_int
+from mpmath.libmp import round_up, from_float, mpf_zeta_int, \
+    from_str, fzero, mpf_psi, mpc_psi
 
 def test_zeta_int_bug():
     assert mpf_zeta_int(0, 10) == from_float(-0.5)
@@ -40,6 +41,12 @@ def test_bernoulli():
     assert str(bernoulli(234)) == '7.6277279396434392486994969020496121553385863373331e+267'
     assert str(bernoulli(10**5)) == '-5.8222943146133508236497045360612887555320691004308e+376755'
     assert str(bernoulli(10**8+2)) == '1.1957035503995297272263047884604346914602088317782e+676752584'
+    # Cached values must not leak between precisions
+    mp.dps = 15
+    assert str(bernoulli(10)) == '0.0757575757575758'
+    assert bernoulli(10) == bernoulli(10)
+    mp.dps = 50
+    assert str(bernoulli(10)) == '0.075757575757575757575757575757575757575757575757576'
 
     mp.dps = 1000
     assert bernoulli(10).ae(mpf(5)/66)
@@ -49,6 +56,16 @@ def test_bernoulli():
 
     mp.dps = 15
 
+
+def test_bernoulli_cache():
+    from mpmath.ctx_mp import MPContext, _BERNOULLI_CACHE_SIZE
+    ctx = MPContext()
+    assert ctx._bernoulli_cache is not mp._bernoulli_cache
+    for prec in range(10, _BERNOULLI_CACHE_SIZE + 50):
+        ctx.prec = prec
+        assert ctx.bernoulli(2) == ctx.mpf(1)/6
+    assert len(ctx._bernoulli_cache) == _BERNOULLI_CACHE_SIZE
+
 def test_bernpoly_eulerpoly():
     mp.dps = 15
     assert bernpoly(0,-1).ae(1)
@@ -389,6 +406,23 @@ def test_polygamma_high_prec():
     assert str(psi(0,pi)) == "0.9772133079420067332920694864061823436408346099943256380095232865318105924777141317302075654362928734"
     assert str(psi(10,pi)) == "-12.98876181434889529310283769414222588307175962213707170773803550518307617769657562747174101900659238"
 
+def test_polygamma_real():
+    # The real code path must agree with the complex one
+    mp.dps = 15
+    for m in [1, 2, 5]:
+        for x in [mpf('1e-10'), 0.25, 3.5, 100, mpf('1e20')]:
+            assert psi(m, x) == psi(m, mpc(x, 0)).real
+    assert psi(1, inf) == 0
+    assert psi(1, -2.5).ae(9.53924664498912)
+
+def test_polygamma_real_prec():
+    # mpf_psi and mpc_psi share one series, so they agree exactly
+    for prec in [53, 100, 300]:
+        for m in [1, 2, 3, 10]:
+            for s in ['0.25', '1', '2.5', '31.75', '1e5']:
+                x = from_str(s, prec)
+                assert mpf_psi(m, x, prec) == mpc_psi(m, (x, fzero), prec)[0]
+
 def test_polygamma_identities():
     mp.dps = 15
     psi0 = lambda z: psi(0,z)
@@ -25,3 +25,17 @@ def test_pickle():
 
     obj = mpc('0.5','0.2')
     assert obj == pickler(obj)
+
+def test_pickle_state():
+    from mpmath.libmp import to_pickable, from_pickable
+    x = mpf(2)**100 + 1
+    assert from_pickable(to_pickable(x._mpf_)) == x._mpf_
+    # The state keeps the hex string form that older releases can read
+    y = mpf(7.75)._mpf_
+    assert from_pickable(to_pickable(y)) == y
+    assert isinstance(to_pickable(y)[1], str)
+    assert from_pickable((0, '1f', -2, 5)) == y
+    z = mpc(x, -x)
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(x, protocol)) == x
+        assert pickle.loads(pickle.dumps(z, protocol)) == z
@@ -1,4 +1,4 @@
-from mpmath import nstr, matrix, inf
+from mpmath import nstr, matrix, inf, mpf, mpc
 
 def test_nstr():
     m = matrix([[0.75, 0.190940654, -0.0299195971],
@@ -12,3 +12,9 @@ def test_nstr():
     '''[    0.75  0.1909   -0.02992]
 [  0.1909  0.6563     0.2057]
 [-0.02992  0.2057  6.445e-21]'''
+
+def test_nstr_sequences():
+    assert nstr([mpf(1)/3, mpf(2)], 5) == '[0.33333, 2.0]'
+    assert nstr((mpf(0.5), mpc(1, 2), [mpf(3)], 'a'), 3) == \
+        "(0.5, (1.0 + 2.0j), [3.0], 'a')"
+    assert nstr([mpf(1e-20)], 3, min_fixed=-inf) == '[0.00000000000000000001]'
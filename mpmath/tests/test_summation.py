@@ -45,9 +45,41 @@ def test_fsum():
     assert fsum([inf,-inf], absolute=1) == inf
     assert fsum([inf,-inf], squared=1) == inf
     assert fsum([inf,-inf], absolute=1, squared=1) == inf
+    assert fsum([mpf(1), mpf(2.5)]) == 3.5
+    assert fsum((mpf(1), mpf(2.5), pi)) == 3.5 + pi
+    assert fsum([mpf(1), mpc(2,3)]) == mpc(3,3)
+    assert fsum([mpf(2), mpf(-3)], absolute=1) == 5
+    assert fsum(iter([1, 0.5, mpf(2), pi, mpc(0,1)])) == mpc(3.5+pi, 1)
+    assert fsum([3, 2.5, mpc(0,1)], squared=1) == 14.25
+    assert fsum([mpc(3,4)], squared=1) == mpc(-7,24)
+    assert fsum([mpc(1,ldexp(1,-40)), j], squared=1) == mpc(-ldexp(1,-80), ldexp(1,-39))
     assert iv.fsum([1,mpi(2,3)]) == mpi(3,4)
 
+def test_fdot():
+    mp.dps = 15
+    assert fdot([], []) == 0
+    assert fdot([2, 1.5, 3], [1, -1, 2]) == 6.5
+    assert fdot([(2, 1), (1.5, -1), (3, 2)]) == 6.5
+    assert fdot([mpf(2), mpf(1.5)], (mpf(1), mpf(-1))) == 0.5
+    assert fdot([mpf(1), mpf(2), mpf(3)], [mpf(1), mpf(2)]) == 5
+    assert fdot([mpf(2), mpf(1)], [mpc(1,1), mpf(3)]) == mpc(5,2)
+    assert fdot([mpf(2), mpf(1)], [mpc(1,1), 3], conjugate=True) == mpc(5,-2)
+    assert fdot([mpf(3), pi], [mpf(0.5), mpf(0)]) == 1.5
+
 def test_fprod():
     mp.dps = 15
     assert fprod([]) == 1
     assert fprod([2,3]) == 6
+    assert fprod([mpf(2), mpf(3), pi]) == 6*pi
+    assert fprod((mpf(2), mpc(0,1))) == mpc(0,2)
+    assert fprod([mpf(2), inf]) == inf
+    # Only the final result is rounded
+    xs = [mpf(k)/7 for k in range(1, 200)]
+    mp.dps = 50
+    p = fprod(xs)
+    mp.dps = 15
+    assert fprod(xs) == +p
+    # The result does not depend on the types of the factors
+    ys = [k % 3 and mpf(k)/7 or k for k in range(1, 200)] + [0.1, pi]
+    assert fprod(ys) == fprod([mpf(y) for y in ys[:-1]] + [pi])
+    assert fprod(iter(ys)) == fprod(ys)